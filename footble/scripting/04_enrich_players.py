@@ -6,54 +6,66 @@ from datetime import datetime
 from collections import defaultdict
 
 
+def compute_transfers_info(transfers: list[dict]) -> dict:
+    transfers_info = {
+        "top_league_transfers": 0,
+        "top_ranked_transfers": 0,
+        "number_of_different_top_clubs": 0,
+        "total_transfers": 0,
+        "max_value_at_transfer": 0,
+        "career_start_date": None,
+        "transfer_list": [],
+    }
+    different_top_clubs = set()
+    for transfer in transfers:
+        transfers_info["transfer_list"].append(transfer)
+        if transfer["is_existing_clubs"] is True:
+            transfers_info["total_transfers"] += 1
+        if transfer["is_top_league_transfer"] is True:
+            transfers_info["top_league_transfers"] += 1
+        if transfer["is_top_ranked_transfer"] is True:
+            transfers_info["top_ranked_transfers"] += 1
+            if transfer["to_team_id"] not in different_top_clubs:
+                transfers_info["number_of_different_top_clubs"] += 1
+        transfers_info["max_value_at_transfer"] = max(
+            transfers_info["max_value_at_transfer"],
+            float(transfer["value_at_transfer"]),
+        )
+        transfer_date = (
+            datetime.strptime(transfer["transfer_date"], "%Y-%m-%d")
+            if transfer["transfer_date"]
+            else None
+        )
+        if transfer_date and (
+            transfers_info["career_start_date"] is None
+            or transfer_date < transfers_info["career_start_date"]
+        ):
+            transfers_info["career_start_date"] = transfer_date
+        different_top_clubs.add(transfer["to_team_id"])
+    return transfers_info
+
+
+def compute_club_ids(transfer_list: list[dict]) -> list:
+    # compute list of clubs the player has played for
+    if not transfer_list:
+        return []
+    club_ids = [transfer["from_team_id"] for transfer in transfer_list]
+    club_ids.append(transfer_list[-1]["to_team_id"])
+    return club_ids
+
+
 def enrich_players_with_transfers_info():
     # read all transfers and count the number of top league transfers for each player
     with open("./data/reduced_transfers.json", "r") as file:
         reduced_transfers = json.load(file)
 
-    transfers_info = defaultdict(
-        lambda: {
-            "top_league_transfers": 0,
-            "top_ranked_transfers": 0,
-            "number_of_different_top_clubs": 0,
-            "total_transfers": 0,
-            "max_value_at_transfer": 0,
-            "career_start_date": None,
-            "transfer_list": [],
-        }
-    )
+    transfers_info = defaultdict(lambda: compute_transfers_info([]))
     for player_id in tqdm(reduced_transfers, desc="Computing transfers info"):
         transfers = reduced_transfers[player_id]
-        different_top_clubs = set()
-        for transfer in transfers:
-            transfers_info[transfer["player_id"]]["transfer_list"].append(transfer)
-            if transfer["is_existing_clubs"] is True:
-                transfers_info[transfer["player_id"]]["total_transfers"] += 1
-            if transfer["is_top_league_transfer"] is True:
-                transfers_info[transfer["player_id"]]["top_league_transfers"] += 1
-            if transfer["is_top_ranked_transfer"] is True:
-                transfers_info[transfer["player_id"]]["top_ranked_transfers"] += 1
-                if transfer["to_team_id"] not in different_top_clubs:
-                    transfers_info[transfer["player_id"]]["number_of_different_top_clubs"] += 1
-            transfers_info[transfer["player_id"]]["max_value_at_transfer"] = max(
-                transfers_info[transfer["player_id"]]["max_value_at_transfer"],
-                float(transfer["value_at_transfer"]),
-            )
-            transfer_date = (
-                datetime.strptime(transfer["transfer_date"], "%Y-%m-%d")
-                if transfer["transfer_date"]
-                else None
+        if transfers:
+            transfers_info[transfers[0]["player_id"]] = compute_transfers_info(
+                transfers
             )
-            if transfer_date and (
-                transfers_info[transfer["player_id"]]["career_start_date"] is None
-                or transfer_date
-                < transfers_info[transfer["player_id"]]["career_start_date"]
-            ):
-                transfers_info[transfer["player_id"]]["career_start_date"] = (
-                    transfer_date
-                )
-            different_top_clubs.add(transfer["to_team_id"])
-
 
     # read the players csv and add the transfers info to the players. need to read manually because the file is too big to fit in memory
     with open("./data/players.json", "r") as file:
@@ -91,17 +103,9 @@ def enrich_players_with_transfers_info():
             if transfers_info[player["player_id"]]["career_start_date"]
             else ""
         )
-        # compute list of clubs the player has played for
-        if transfers_info[player["player_id"]]["transfer_list"]:
-            club_ids = [
-                transfer["from_team_id"]
-                for transfer in transfers_info[player["player_id"]]["transfer_list"]
-            ]
-            club_ids.append(
-                transfers_info[player["player_id"]]["transfer_list"][-1]["to_team_id"]
-            )
-        else:
-            club_ids = []
+        club_ids = compute_club_ids(
+            transfers_info[player["player_id"]]["transfer_list"]
+        )
         enriched_players.append(
             {
                 **player,
@@ -0,0 +1,176 @@
+#!/usr/bin/env -S uv --quiet run --script
+# Random access to a single player's raw transfers without loading the whole
+# transfers.json. `build` records the byte range of every transfer record
+# grouped by player_id, the other commands read those ranges back through mmap.
+#
+#   ./inspect_player_transfers.py build
+#   ./inspect_player_transfers.py show <player_id>
+#   ./inspect_player_transfers.py reduce <player_id>
+import argparse
+import hashlib
+import importlib
+import json
+import mmap
+import os
+import sqlite3
+from tqdm import tqdm
+
+TRANSFERS_PATH = "./data/transfers.json"
+INDEX_PATH = "./data/transfers_index.sqlite"
+
+# the pipeline scripts start with a digit, so they can't be imported with a plain import statement
+reduce_transfers = importlib.import_module("03_reduce_transfers")
+enrich_players = importlib.import_module("04_enrich_players")
+
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def iter_transfer_ranges(text: str):
+    # walk the top level json array and yield each transfer with its byte range in the file
+    decoder = json.JSONDecoder()
+    char_offset = 0
+    byte_offset = 0
+
+    def to_byte_offset(index: int) -> int:
+        # raw_decode works with character offsets, mmap needs byte offsets
+        nonlocal char_offset, byte_offset
+        byte_offset += len(text[char_offset:index].encode("utf-8"))
+        char_offset = index
+        return byte_offset
+
+    def skip_whitespace(index: int) -> int:
+        while index < len(text) and text[index] in " \t\n\r":
+            index += 1
+        return index
+
+    index = skip_whitespace(0)
+    if index == len(text) or text[index] != "[":
+        raise ValueError(f"{TRANSFERS_PATH} is not a json array")
+    index = skip_whitespace(index + 1)
+    while index < len(text) and text[index] != "]":
+        transfer, end = decoder.raw_decode(text, index)
+        yield transfer, to_byte_offset(index), to_byte_offset(end)
+        index = skip_whitespace(end)
+        if index < len(text) and text[index] == ",":
+            index = skip_whitespace(index + 1)
+
+
+def build_index():
+    stat = os.stat(TRANSFERS_PATH)
+    source_hash = hash_file(TRANSFERS_PATH)
+    with open(TRANSFERS_PATH, "r", encoding="utf-8") as file:
+        text = file.read()
+
+    # build next to the final index and swap it in, so a failed build never leaves a half written index
+    tmp_path = f"{INDEX_PATH}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    connection.execute("CREATE TABLE source (size INTEGER, mtime_ns INTEGER, sha256 TEXT)")
+    connection.execute("CREATE TABLE transfers (player_id TEXT, start INTEGER, end INTEGER)")
+    connection.execute(
+        "INSERT INTO source VALUES (?, ?, ?)",
+        (stat.st_size, stat.st_mtime_ns, source_hash),
+    )
+    connection.executemany(
+        "INSERT INTO transfers VALUES (?, ?, ?)",
+        (
+            (str(transfer["player_id"]), start, end)
+            for transfer, start, end in tqdm(
+                iter_transfer_ranges(text), desc="Indexing transfers by player"
+            )
+        ),
+    )
+    connection.execute("CREATE INDEX transfers_player_id ON transfers (player_id, start)")
+    connection.commit()
+    connection.close()
+    os.replace(tmp_path, INDEX_PATH)
+
+
+def open_index() -> sqlite3.Connection:
+    if not os.path.exists(INDEX_PATH):
+        raise SystemExit(f"No index at {INDEX_PATH}, run `build` first")
+    connection = sqlite3.connect(INDEX_PATH)
+    size, mtime_ns, source_hash = connection.execute(
+        "SELECT size, mtime_ns, sha256 FROM source"
+    ).fetchone()
+
+    # the index is valid as long as the source hash is unchanged. hashing 300+ MB on every
+    # lookup is slow though, so only do it when the size or mtime don't match anymore
+    stat = os.stat(TRANSFERS_PATH)
+    if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+        return connection
+    if stat.st_size == size and hash_file(TRANSFERS_PATH) == source_hash:
+        connection.execute("UPDATE source SET mtime_ns = ?", (stat.st_mtime_ns,))
+        connection.commit()
+        return connection
+    connection.close()
+    raise SystemExit(f"{TRANSFERS_PATH} changed since the index was built, run `build` again")
+
+
+def read_player_transfers(player_id: str) -> list[dict]:
+    connection = open_index()
+    ranges = connection.execute(
+        "SELECT start, end FROM transfers WHERE player_id = ? ORDER BY start",
+        (player_id,),
+    ).fetchall()
+    connection.close()
+    if not ranges:
+        return []
+
+    with open(TRANSFERS_PATH, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return [json.loads(data[start:end]) for start, end in ranges]
+
+
+def reduce_player(player_id: str) -> dict:
+    # re-run the 03 and 04 logic for a single player
+    with open("./data/clubs.json", "r") as file:
+        clubs = json.load(file)
+    all_clubs = {club["club_id"] for club in clubs}
+    club_parent_map = {club["club_id"]: club["parent_club_id"] for club in clubs}
+
+    player_transfers = read_player_transfers(player_id)
+    reduced_transfers = reduce_transfers.reduce_player_transfers(
+        # 03 rewrites the team ids in place, keep the raw transfers untouched
+        [dict(transfer) for transfer in player_transfers],
+        all_clubs,
+        club_parent_map,
+    )
+    if reduced_transfers is None:
+        return {
+            "player_id": player_id,
+            "raw_transfers": player_transfers,
+            "error": "player has a transfer with no date",
+        }
+
+    transfers_info = enrich_players.compute_transfers_info(reduced_transfers)
+    return {
+        "player_id": player_id,
+        "raw_transfers": player_transfers,
+        **transfers_info,
+        "club_ids": enrich_players.compute_club_ids(transfers_info["transfer_list"]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="index transfers.json by player_id")
+    show_parser = subparsers.add_parser("show", help="print a player's raw transfers")
+    show_parser.add_argument("player_id")
+    reduce_parser = subparsers.add_parser(
+        "reduce", help="re-run the 03/04 logic for a single player"
+    )
+    reduce_parser.add_argument("player_id")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_index()
+    elif args.command == "show":
+        print(json.dumps(read_player_transfers(args.player_id), indent=4))
+    elif args.command == "reduce":
+        print(json.dumps(reduce_player(args.player_id), indent=4, default=str))